@@ -3,23 +3,81 @@ import streamlit as st
 import sqlite3
 import json
 import re
-import pandas as pd
+import csv
+import io
+import calendar
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 
+_SUBTASK_RE = re.compile(r"(\d{4}):\s*(.+)")
+DATE_CODE_FMT = "%m%d"
+DATE_LABEL_FMT = "%B %d"
+# MMDD -> "Month DD" for every valid day (leap year so 0229 is accepted)
+_MMDD_TO_STR = {
+    f"{m:02d}{d:02d}": datetime(2000, m, d).strftime(DATE_LABEL_FMT)
+    for m in range(1, 13)
+    for d in range(1, calendar.monthrange(2000, m)[1] + 1)
+}
+
+# --- Navigation targets: (label, page number) ---
+NAV = [
+    ("🏠 Dashboard", "1"),
+    ("➕ Create Task", "2"),
+    ("📋 Current Tasks", "3"),
+    ("📅 Daily Tasks", "4"),
+    ("📂 Project Overview", "5"),
+]
+QUICK_NAV = [
+    ("➕ Create Task", "2"),
+    ("📋 View Tasks", "3"),
+    ("📅 Daily Tasks", "4"),
+    ("📂 Project Overview", "5"),
+]
+
+# --- SQL statements (identical text so sqlite3's statement cache hits on reuse) ---
+SQL_SELECT_TASKS = "SELECT id, project, task, description, status FROM tasks"
+SQL_SELECT_SUBTASKS = "SELECT id, task_id, date_code, date_str, title, status FROM subtasks ORDER BY task_id, id"
+SQL_INSERT = "INSERT INTO tasks (project, task, description, status) VALUES (?, ?, ?, ?)"
+SQL_INSERT_SUBTASK = "INSERT INTO subtasks (task_id, date_code, date_str, title, status) VALUES (?, ?, ?, ?, ?)"
+SQL_COMPLETE_SUBTASK = "UPDATE subtasks SET status = 'Completed' WHERE id = ?"
+SQL_DELETE_SUBTASKS = "DELETE FROM subtasks WHERE task_id = ?"
+SQL_UPDATE_DESCRIPTION = "UPDATE tasks SET description = ? WHERE id = ?"
+SQL_DELETE = "DELETE FROM tasks WHERE id = ?"
+SQL_LIST_PROJECTS = "SELECT DISTINCT project FROM tasks ORDER BY project"
+SQL_LIST_TASKS = "SELECT task FROM tasks ORDER BY task"
+SQL_LIST_PROJECT_TASKS = "SELECT task FROM tasks WHERE project = ? ORDER BY task"
+SQL_SELECT_DAILY = """
+    SELECT s.id, s.date_code, s.title, s.status, t.task, t.project
+    FROM subtasks s JOIN tasks t ON t.id = s.task_id
+    WHERE s.date_code <= :today AND NOT (s.status = 'Completed' AND s.date_code < :today)
+    ORDER BY s.date_code, s.id
+"""
+SQL_EXPORT = """
+    SELECT t.project, t.task, t.description, t.status,
+        (SELECT GROUP_CONCAT(line, char(10)) FROM (
+            SELECT s.date_str || ': ' || s.title || ' [' || s.status || ']' AS line
+            FROM subtasks s WHERE s.task_id = t.id ORDER BY s.id
+        ))
+    FROM tasks t ORDER BY t.id
+"""
+SQL_DASHBOARD_COUNTS = """
+    SELECT
+        COALESCE(SUM(date_code < :today), 0),
+        COALESCE(SUM(date_code = :today), 0),
+        (SELECT COUNT(DISTINCT project) FROM tasks),
+        (SELECT COUNT(*) FROM tasks)
+    FROM subtasks
+    WHERE date_code <= :today AND status != 'Completed'
+"""
+
 # --- Extract subtasks from description ---
 def extract_subtasks(description_text):
     subtasks = []
-    pattern = r"(\d{4}):\s*(.+)"
-    matches = re.findall(pattern, description_text)
+    matches = _SUBTASK_RE.findall(description_text)
 
     for code, text in matches:
-        month = int(code[:2])
-        day = int(code[2:])
-        try:
-            date_obj = datetime.strptime(f"{month:02d}{day:02d}", "%m%d")
-            date_str = date_obj.strftime("%B %d")
-        except ValueError:
-            date_str = f"Invalid date ({code})"
+        date_str = _MMDD_TO_STR.get(code, f"Invalid date ({code})")
         subtasks.append({
             "date_code": code,
             "date_str": date_str,
@@ -29,93 +87,162 @@ def extract_subtasks(description_text):
     return subtasks
 
 # --- DB Setup ---
+@st.cache_resource
+def _thread_conns():
+    # Survives reruns; holds one connection per session thread
+    return threading.local()
+
+def get_conn():
+    # Long-lived per-thread connection (autocommit mode). Sessions never share one, so under
+    # WAL every reader sees a committed snapshot, never another session's open transaction.
+    local = _thread_conns()
+    conn = getattr(local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect("tasks.db", isolation_level=None, cached_statements=256)
+        # Per-connection tuning; applied once per thread since the connection is kept
+        conn.execute("PRAGMA busy_timeout=5000")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA cache_size=-20000")
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.row_factory = sqlite3.Row
+        local.conn = conn
+    return conn
+
+@st.cache_resource
+def get_write_lock():
+    # Serializes writers across sessions so they queue here instead of on SQLITE_BUSY
+    return threading.Lock()
+
+@contextmanager
+def transaction():
+    # The per-thread connection autocommits; group multi-statement writes into one BEGIN/COMMIT.
+    # The write lock only queues writers. Isolation from other sessions' reads comes from each
+    # thread having its own connection: they read a committed WAL snapshot, and a ROLLBACK here
+    # cannot touch their in-flight statements.
+    conn = get_conn()
+    with get_write_lock(), conn:
+        conn.execute("BEGIN IMMEDIATE")
+        yield conn.cursor()
+
+@st.cache_resource
 def init_db():
-    conn = sqlite3.connect("tasks.db")
-    c = conn.cursor()
+    # Schema setup and the legacy migration run once per process, not on every rerun
+    c = get_conn().cursor()
+    # WAL persists in the database file; set it here since init_db only runs at startup
+    c.execute("PRAGMA journal_mode=WAL")
     c.execute('''
         CREATE TABLE IF NOT EXISTS tasks (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             project TEXT,
             task TEXT,
             description TEXT,
+            status TEXT
+        )
+    ''')
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS subtasks (
+            id INTEGER PRIMARY KEY,
+            task_id INTEGER,
+            date_code TEXT,
+            date_str TEXT,
+            title TEXT,
             status TEXT,
-            subtasks TEXT
+            FOREIGN KEY(task_id) REFERENCES tasks(id) ON DELETE CASCADE
         )
     ''')
-    conn.commit()
-    conn.close()
-
+    c.execute("CREATE INDEX IF NOT EXISTS idx_sub_task ON subtasks(task_id)")
+    # (date_code, status) covers the Dashboard and Daily filters; it supersedes idx_sub_date
+    c.execute("DROP INDEX IF EXISTS idx_sub_date")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_sub_date_status ON subtasks(date_code, status)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_sub_status ON subtasks(status)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_tasks_project ON tasks(project, task)")
+
+    # Move subtasks stored as JSON blobs by older versions into the subtasks table
+    columns = [row[1] for row in c.execute("PRAGMA table_info(tasks)")]
+    if "subtasks" in columns:
+        # Read and convert inside one transaction so the blobs are imported exactly once
+        with transaction() as tc:
+            legacy = tc.execute("SELECT id, subtasks FROM tasks WHERE subtasks IS NOT NULL").fetchall()
+            rows = []
+            for task_id, subtasks_json in legacy:
+                rows.extend(
+                    (task_id, s["date_code"], s["date_str"], s["title"], s["status"]) for s in json.loads(subtasks_json)
+                )
+            tc.executemany(SQL_INSERT_SUBTASK, rows)
+            tc.execute("UPDATE tasks SET subtasks = NULL WHERE subtasks IS NOT NULL")
+        if legacy:
+            # Refresh planner statistics after the bulk load
+            c.execute("ANALYZE")
+
+@st.cache_data(ttl=300)
 def load_tasks_from_db():
-    conn = sqlite3.connect("tasks.db")
-    c = conn.cursor()
-    c.execute("SELECT project, task, description, status, subtasks FROM tasks")
-    rows = c.fetchall()
-    conn.close()
-
-    tasks = []
-    for row in rows:
-        project, task, description, status, subtasks_json = row
-        subtasks = json.loads(subtasks_json)
-        tasks.append({
-            "project": project,
-            "task": task,
-            "description": description,
-            "status": status,
-            "subtasks": subtasks
-        })
+    c = get_conn().cursor()
+    # Rows come back as sqlite3.Row; st.cache_data pickles its result, so copy them into dicts
+    tasks = [dict(row, subtasks=[]) for row in c.execute(SQL_SELECT_TASKS)]
+    by_id = {t["id"]: t for t in tasks}
+
+    for row in c.execute(SQL_SELECT_SUBTASKS):
+        sub = dict(row)
+        task = by_id.get(sub.pop("task_id"))
+        if task is not None:
+            task["subtasks"].append(sub)
     return tasks
 
+@st.cache_data(ttl=60)
+def list_projects():
+    return [r[0] for r in get_conn().execute(SQL_LIST_PROJECTS)]
+
+@st.cache_data(ttl=60)
+def list_tasks(project=None):
+    if project is None:
+        return [r[0] for r in get_conn().execute(SQL_LIST_TASKS)]
+    return [r[0] for r in get_conn().execute(SQL_LIST_PROJECT_TASKS, (project,))]
+
+def refresh_tasks():
+    # Drop the cached snapshots after a write; the next rerun reloads session state
+    load_tasks_from_db.clear()
+    list_projects.clear()
+    list_tasks.clear()
+
 init_db()
-if "tasks" not in st.session_state:
-    st.session_state.tasks = load_tasks_from_db()
+# Re-read on every rerun: served from the cache, and picks up writes made by other sessions
+st.session_state.tasks = load_tasks_from_db()
 if "edit_mode" not in st.session_state:
     st.session_state.edit_mode = {}
 
 # --- Read page from query params (default to Dashboard) ---
-query_params = st.query_params
-page = query_params.get("page", ["Dashboard"])[0]
+page = st.query_params.get("page", "1")
+
+# --- Today's date, computed once per rerun and shared by the Daily and Dashboard pages ---
+today_code = datetime.now().strftime(DATE_CODE_FMT)
 
 # --- Manual navigation buttons in sidebar ---
 st.sidebar.title("Navigation")
-if st.sidebar.button("🏠 Dashboard"):
-    st.query_params.update({"page": "1 Dashboard"})
-    st.rerun()
-if st.sidebar.button("➕ Create Task"):
-    st.query_params.update({"page": "2 Create Task"})
-    st.rerun()
-if st.sidebar.button("📋 Current Tasks"):
-    st.query_params.update({"page": "3 Current Tasks"})
-    st.rerun()
-if st.sidebar.button("📅 Daily Tasks"):
-    st.query_params.update({"page": "4 Daily Tasks"})
-    st.rerun()
-if st.sidebar.button("📂 Project Overview"):
-    st.query_params.update({"page": "5 Project Overview"})
-    st.rerun()
+for label, target in NAV:
+    if st.sidebar.button(label, key=f"nav-{target}"):
+        st.query_params["page"] = target
+        st.rerun()
 
 # --- Export Button ---
-def export_all_tasks_to_csv(filename="all_tasks_export.csv"):
-    conn = sqlite3.connect("tasks.db")
-    c = conn.cursor()
-    c.execute("SELECT project, task, description, status, subtasks FROM tasks")
-    rows = c.fetchall()
-    conn.close()
-
-    def format_subtasks(subtask_json):
-        try:
-            subtasks = json.loads(subtask_json)
-            return "\n".join([f"{s.get('date_str', '?')}: {s.get('title', '?')} [{s.get('status', '?')}]" for s in subtasks])
-        except:
-            return "[Invalid subtasks]"
-
-    data = [[p, t, d, s, format_subtasks(subs)] for p, t, d, s, subs in rows]
-    df = pd.DataFrame(data, columns=["Project", "Task", "Description", "Status", "Subtasks"])
-    df.to_csv(filename, index=False)
-    return filename
+EXPORT_FILENAME = "all_tasks_export.csv"
+
+def export_all_tasks_to_csv():
+    # Subtask lines are concatenated by SQLite; the cursor streams straight into the writer
+    c = get_conn().cursor()
+    c.execute(SQL_EXPORT)
+
+    # Build the CSV in memory; nothing is written to disk
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow(["Project", "Task", "Description", "Status", "Subtasks"])
+    writer.writerows(c)
+    return buf.getvalue()
 
 st.markdown("---")
 if st.button("⬅️ Back to Dashboard", key="back-dashboard"):
-    st.query_params.update({"page": "1"})  # Assuming "1" maps to Dashboard
+    st.query_params["page"] = "1"
     st.rerun()
 
 
@@ -131,22 +258,13 @@ if page == "2":
     if st.button("Save Task"):
         if project and task:
             subtasks = extract_subtasks(description)
-            conn = sqlite3.connect("tasks.db")
-            c = conn.cursor()
-            c.execute('''
-                INSERT INTO tasks (project, task, description, status, subtasks)
-                VALUES (?, ?, ?, ?, ?)''',
-                (project, task, description, status, json.dumps(subtasks)))
-            conn.commit()
-            conn.close()
-
-            st.session_state.tasks.append({
-                "project": project,
-                "task": task,
-                "description": description,
-                "status": status,
-                "subtasks": subtasks
-            })
+            with transaction() as c:
+                c.execute(SQL_INSERT, (project, task, description, status))
+                task_id = c.lastrowid
+                c.executemany(SQL_INSERT_SUBTASK, [
+                    (task_id, s["date_code"], s["date_str"], s["title"], s["status"]) for s in subtasks
+                ])
+            refresh_tasks()
             st.success(f"Task '{task}' under project '{project}' saved!")
             st.rerun()
         else:
@@ -159,23 +277,27 @@ if page == "3":
     st.markdown("---")
     st.markdown("### 📤 Export All Tasks")
     if st.button("Export All Tasks to CSV", key="export-csv"):
-        filename = export_all_tasks_to_csv()
-        st.success(f"Tasks exported to `{filename}`")
-        with open(filename, "rb") as f:
-            st.download_button("⬇️ Download CSV", f, file_name=filename, mime="text/csv", key="download-csv")
+        csv_data = export_all_tasks_to_csv()
+        st.success("Tasks exported to CSV")
+        st.download_button("⬇️ Download CSV", csv_data, file_name=EXPORT_FILENAME, mime="text/csv", key="download-csv")
 
     if st.session_state.tasks:
-        projects = sorted(set(t["project"] for t in st.session_state.tasks))
+        projects = list_projects()
         selected_project = st.selectbox("Filter by Project", ["All Projects"] + projects)
 
-        filtered = [t for t in st.session_state.tasks if selected_project == "All Projects" or t["project"] == selected_project]
-        tasks = sorted(t["task"] for t in filtered)
+        if selected_project == "All Projects":
+            filtered = st.session_state.tasks
+            tasks = list_tasks()
+        else:
+            filtered = [t for t in st.session_state.tasks if t["project"] == selected_project]
+            tasks = list_tasks(selected_project)
         selected_task = st.selectbox("Filter by Task", ["All Tasks"] + tasks)
 
         if selected_task != "All Tasks":
             filtered = [t for t in filtered if t["task"] == selected_task]
 
-        for idx, task in enumerate(filtered):
+        for task in filtered:
+            task_id = task["id"]
             col_main, col_del, col_edit = st.columns([10, 1, 1])
 
             with col_main:
@@ -183,48 +305,44 @@ if page == "3":
                 st.markdown(f"**Main Status:** {task['status']}")
                 if task["subtasks"]:
                     st.markdown("**Subtasks:**")
-                    for sub_idx, sub in enumerate(task["subtasks"]):
+                    for sub in task["subtasks"]:
                         s1, s2 = st.columns([20, 1])
                         with s1:
                             st.markdown(f"- [{sub['status']}] **{sub['date_str']}**: {sub['title']}")
                         with s2:
-                            if st.button("✅", key=f"complete-{idx}-{sub_idx}"):
-                                task["subtasks"][sub_idx]["status"] = "Completed"
-                                conn = sqlite3.connect("tasks.db")
-                                c = conn.cursor()
-                                c.execute("UPDATE tasks SET subtasks = ? WHERE project = ? AND task = ?", (json.dumps(task["subtasks"]), task["project"], task["task"]))
-                                conn.commit()
-                                conn.close()
+                            if st.button("✅", key=f"complete-{sub['id']}"):
+                                with get_write_lock():
+                                    c = get_conn().cursor()
+                                    c.execute(SQL_COMPLETE_SUBTASK, (sub["id"],))
+                                refresh_tasks()
                                 st.rerun()
 
             with col_del:
-                if st.button("🗑️", key=f"delete-{idx}"):
-                    conn = sqlite3.connect("tasks.db")
-                    c = conn.cursor()
-                    c.execute("DELETE FROM tasks WHERE project = ? AND task = ?", (task["project"], task["task"]))
-                    conn.commit()
-                    conn.close()
-                    st.session_state.tasks.pop(idx)
+                if st.button("🗑️", key=f"delete-{task_id}"):
+                    with get_write_lock():
+                        c = get_conn().cursor()
+                        c.execute(SQL_DELETE, (task_id,))
+                    refresh_tasks()
                     st.rerun()
 
             with col_edit:
-                if st.button("✏️", key=f"edit-{idx}"):
-                    st.session_state.edit_mode[idx] = True
+                if st.button("✏️", key=f"edit-{task_id}"):
+                    st.session_state.edit_mode[task_id] = True
 
-            if st.session_state.edit_mode.get(idx, False):
+            if st.session_state.edit_mode.get(task_id, False):
                 st.markdown("**Edit Task Description:**")
-                new_desc = st.text_area("Description", value=task["description"], key=f"edit-desc-{idx}")
-                if st.button("💾 Save Changes", key=f"save-{idx}"):
+                new_desc = st.text_area("Description", value=task["description"], key=f"edit-desc-{task_id}")
+                if st.button("💾 Save Changes", key=f"save-{task_id}"):
                     new_subtasks = extract_subtasks(new_desc)
-                    task["description"] = new_desc
-                    task["subtasks"] = new_subtasks
-                    conn = sqlite3.connect("tasks.db")
-                    c = conn.cursor()
-                    c.execute("UPDATE tasks SET description = ?, subtasks = ? WHERE project = ? AND task = ?", (new_desc, json.dumps(new_subtasks), task["project"], task["task"]))
-                    conn.commit()
-                    conn.close()
+                    with transaction() as c:
+                        c.execute(SQL_UPDATE_DESCRIPTION, (new_desc, task_id))
+                        c.execute(SQL_DELETE_SUBTASKS, (task_id,))
+                        c.executemany(SQL_INSERT_SUBTASK, [
+                            (task_id, s["date_code"], s["date_str"], s["title"], s["status"]) for s in new_subtasks
+                        ])
+                    refresh_tasks()
                     st.success("✅ Task updated.")
-                    st.session_state.edit_mode[idx] = False
+                    st.session_state.edit_mode[task_id] = False
                     st.rerun()
     else:
         st.info("No tasks available.")
@@ -233,54 +351,44 @@ if page == "3":
 if page == "4":
     st.title("📅 Today's Subtasks")
 
-    today_code = datetime.now().strftime("%m%d")
-    today_num = int(today_code)
-
     grouped_tasks = {}  # {(task, project): [subtasks]}
 
-    for idx, task in enumerate(st.session_state.tasks):
-        for sub_idx, subtask in enumerate(task["subtasks"]):
-            sub_num = int(subtask["date_code"])
-            status = subtask["status"]
-
-            # Show only tasks due today or overdue (and not yet completed)
-            if sub_num <= today_num and not (status == "Completed" and sub_num < today_num):
-                key = (task["task"], task["project"])
-                if key not in grouped_tasks:
-                    grouped_tasks[key] = []
-                grouped_tasks[key].append((sub_idx, subtask, idx))  # (sub_idx, subtask, task_idx)
+    # Due today or overdue (and not yet completed), filtered in SQL
+    c = get_conn().cursor()
+    c.execute(SQL_SELECT_DAILY, {"today": today_code})
+    for sub_id, date_code, title, status, task_name, project_name in c.fetchall():
+        key = (task_name, project_name)
+        if key not in grouped_tasks:
+            grouped_tasks[key] = []
+        grouped_tasks[key].append((sub_id, date_code, title, status))
 
     if not grouped_tasks:
         st.info("No subtasks due today or earlier.")
     else:
         for (task_name, project_name), sublist in grouped_tasks.items():
             st.markdown(f"### 🔹 From Task: {task_name}, Project: {project_name}")
-            for sub_idx, subtask, task_idx in sublist:
-                col1, col2 = st.columns([6, 1])
-                with col1:
-                    status = subtask["status"]
-                    title = subtask["title"]
-
-                    if status == "Completed":
-                        st.markdown(f"<span style='color:gray'><s>{title}</s></span>", unsafe_allow_html=True)
-                    elif int(subtask["date_code"]) < today_num:
-                        st.markdown(f"<span style='color:red'>[Overdue] {title}</span>", unsafe_allow_html=True)
-                    else:
-                        st.markdown(f"**{title}**")
-
-                with col2:
-                    if status != "Completed":
-                        if st.button("✅", key=f"complete-today-{task_idx}-{sub_idx}"):
-                            st.session_state.tasks[task_idx]["subtasks"][sub_idx]["status"] = "Completed"
-
-                            # Update DB
-                            conn = sqlite3.connect("tasks.db")
-                            c = conn.cursor()
-                            c.execute("UPDATE tasks SET subtasks = ? WHERE project = ? AND task = ?",
-                                      (json.dumps(st.session_state.tasks[task_idx]["subtasks"]),
-                                       project_name, task_name))
-                            conn.commit()
-                            conn.close()
+
+            # Display pass: one markdown message for the whole group
+            rendered_rows = []
+            for sub_id, date_code, title, status in sublist:
+                if status == "Completed":
+                    rendered_rows.append(f"<span style='color:gray'><s>{title}</s></span>")
+                elif date_code < today_code:
+                    rendered_rows.append(f"<span style='color:red'>[Overdue] {title}</span>")
+                else:
+                    rendered_rows.append(f"<b>{title}</b>")
+            st.markdown("<br>".join(rendered_rows), unsafe_allow_html=True)
+
+            # Action pass: buttons only for subtasks that can still be completed
+            actionable = [(sub_id, title) for sub_id, _, title, status in sublist if status != "Completed"]
+            if actionable:
+                for col, (sub_id, title) in zip(st.columns(len(actionable)), actionable):
+                    with col:
+                        if st.button(f"✅ {title}", key=f"complete-today-{sub_id}"):
+                            with get_write_lock():
+                                c = get_conn().cursor()
+                                c.execute(SQL_COMPLETE_SUBTASK, (sub_id,))
+                            refresh_tasks()
                             st.rerun()
                         
 # --- Part 5: Project Overview Page ---
@@ -300,7 +408,7 @@ if page == "5":
                 for task in task_list:
                     with st.expander(f"📄 {task['task']}"):
                         if task["subtasks"]:
-                            st.markdown("**Subtasks:**")
+                            rendered_rows = ["<b>Subtasks:</b>"]
                             for sub in task["subtasks"]:
                                 status = sub["status"]
                                 if status == "Completed":
@@ -309,7 +417,8 @@ if page == "5":
                                     color = "orange"
                                 else:
                                     color = "red"
-                                st.markdown(f"<span style='color:{color}'>[{status}] {sub['date_str']}: {sub['title']}</span>", unsafe_allow_html=True)
+                                rendered_rows.append(f"<span style='color:{color}'>[{status}] {sub['date_str']}: {sub['title']}</span>")
+                            st.markdown("<br>".join(rendered_rows), unsafe_allow_html=True)
                         else:
                             st.markdown("_No subtasks found._")
     else:
@@ -319,24 +428,10 @@ if page == "5":
 if page == "1":
     st.title("📊 Protocol Tracker Dashboard")
 
-    total_projects = len(set(task["project"] for task in st.session_state.tasks))
-    total_tasks = len(st.session_state.tasks)
-
-    today = datetime.now()
-    today_code = today.strftime("%m%d")
-    today_num = int(today_code)
-
-    overdue_count = 0
-    today_count = 0
-
-    for task in st.session_state.tasks:
-        for sub in task.get("subtasks", []):
-            sub_num = int(sub["date_code"])
-            if sub["status"] != "Completed":
-                if sub_num < today_num:
-                    overdue_count += 1
-                elif sub_num == today_num:
-                    today_count += 1
+    # All four metrics in one aggregate query
+    c = get_conn().cursor()
+    c.execute(SQL_DASHBOARD_COUNTS, {"today": today_code})
+    overdue_count, today_count, total_projects, total_tasks = c.fetchone()
 
     col1, col2, col3, col4 = st.columns(4)
     with col1:
@@ -353,19 +448,10 @@ if page == "1":
     st.markdown("### Quick Navigation")
     col_nav1, col_nav2 = st.columns(2)
 
-    with col_nav1:
-        if st.button("➕ Create Task", key="nav-create-btn"):
-            st.query_params.update({"page": "2"})
-            st.rerun()
-        if st.button("📋 View Tasks", key="nav-tasks-btn"):
-            st.query_params.update({"page": "3"})
-            st.rerun()
-
-    with col_nav2:
-        if st.button("📅 Daily Tasks", key="nav-daily-btn"):
-            st.query_params.update({"page": "4"})
-            st.rerun()
-        if st.button("📂 Project Overview", key="nav-projects-btn"):
-            st.query_params.update({"page": "5"})
-            st.rerun()
+    for col, items in ((col_nav1, QUICK_NAV[:2]), (col_nav2, QUICK_NAV[2:])):
+        with col:
+            for label, target in items:
+                if st.button(label, key=f"quick-nav-{target}"):
+                    st.query_params["page"] = target
+                    st.rerun()
 